@@ -1,58 +1,48 @@
 #!/usr/bin/env python3
 import os
 import json
+from array import array
+from sys import intern
 from flask import Flask, render_template, request, jsonify
 
-app = Flask(__name__)
+from contractstore import ContractStore, DB_FILE, DEFAULT_CACHE_SIZE
+from parsing import (
+    parse_salary, parse_team, parse_positions, clean_team_code,
+    CUR_SEASON, get_current_season_salary, get_contract_summary,
+)
 
-# ─── Utility Functions ─────────────────────────────────────────────────────
+app = Flask(__name__)
 
-def parse_salary(salary):
-    """
-    Converts '$13,250,000' to 13250000.0, leaves numbers untouched.
-    """
-    if isinstance(salary, (int, float)):
-        return float(salary)
-    if not salary:
-        return 0.0
-    # strip out dollar signs, commas, spaces
-    return float(salary.replace('$', '').replace(',', '').replace(' ', ''))
-
-def parse_team(team_str):
-    """
-    Player JSON is stored as e.g. 'TOR, C'; return 'TOR' to match team codes.
-    """
-    return team_str.split(',')[0].strip() if team_str else ''
+# ─── Load & Shape Data ──────────────────────────────────────────────────────
 
-def clean_team_code(team_code):
+def resolve_data_dir():
     """
-    If the team code is doubled (e.g. 'VGKVGK'), return only the first half.
+    Returns the directory holding the JSON data: the version published by
+    scrapepipeline.py (named in data/CURRENT) if there is one, otherwise
+    the files checked in beside this script.
     """
-    if team_code:
-        length = len(team_code)
-        half = length // 2
-        if length % 2 == 0 and team_code[:half] == team_code[half:]:
-            return team_code[:half]
-    return team_code
-
-# ─── Load & Shape Data ──────────────────────────────────────────────────────
+    base = os.path.dirname(os.path.abspath(__file__))
+    try:
+        with open(os.path.join(base, "data", "CURRENT"), encoding="utf-8") as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return base
+    return os.path.join(base, "data", version) if version else base
 
-def load_players():
+def load_players(data_dir):
     """
     Loads all_contracts.json into a dict: { player_name: {team, salary, contract_breakdown} }
     """
-    base = os.path.dirname(__file__)
-    path = os.path.join(base, "all_contracts.json")
+    path = os.path.join(data_dir, "all_contracts.json")
     with open(path, encoding="utf-8") as f:
         return json.load(f)
 
-def load_teams():
+def load_teams(data_dir):
     """
     Loads nhl_team_caps.json, normalizes the relevant columns, and
     returns a dict: { TEAM_CODE: { active_cap, cap_space, total_cap } }
     """
-    base = os.path.dirname(__file__)
-    path = os.path.join(base, "nhl_team_caps.json")
+    path = os.path.join(data_dir, "nhl_team_caps.json")
     with open(path, encoding="utf-8") as f:
         team_list = json.load(f)
 
@@ -69,66 +59,113 @@ def load_teams():
         }
     return teams
 
-players_data = load_players()
-teams_data   = load_teams()
+# CONTRACT_STORE=sqlite keeps full contracts on disk in contracts.sqlite and
+# only the indexes below in memory; the default loads all_contracts.json whole.
+CONTRACT_STORE      = os.environ.get("CONTRACT_STORE", "json")
+CONTRACT_CACHE_SIZE = int(os.environ.get("CONTRACT_CACHE_SIZE", DEFAULT_CACHE_SIZE))
 
-# ─── Contract Helpers ───────────────────────────────────────────────────────
+# Resolve once so players and teams always come from the same data version
+DATA_DIR = resolve_data_dir()
+if CONTRACT_STORE == "sqlite":
+    contract_store = ContractStore(os.path.join(DATA_DIR, DB_FILE), CONTRACT_CACHE_SIZE)
+    players_data   = None
+else:
+    contract_store = None
+    players_data   = load_players(DATA_DIR)
+teams_data = load_teams(DATA_DIR)
 
-CUR_SEASON = 2024  # adjust as needed for the current NHL season start
+# ─── Load-Time Indexes ─────────────────────────────────────────────────────
 
-def get_current_season_salary(player):
+def build_indexes(players, current_season_start=CUR_SEASON):
     """
-    From the player's contract_breakdown, find the row where Year starts
-    with the current season (e.g. '2024-25') and return its Cap HitAnnual.
-    Fallback to the first row if no exact match.
+    Takes (player_name, player) pairs in sorted-name order, assigns every
+    player an integer id (their slot in that order) and builds reverse
+    indexes over those ids, so filtering by team, position or expiry season
+    never has to scan the whole player table. Only the scalars below are
+    kept, never the contract_breakdown, so `players` may be a stream:
+
+      names       : [player_name, ...]              id -> name
+      ids         : { player_name: id }
+      position    : [ 'C/LW', ... ]                 id -> position string
+      cap_hit     : array('d')                      id -> current-season cap hit
+      years_left  : array('H')                      id -> seasons remaining
+      expires     : [ '2027-28' | None, ... ]       id -> final contract season
+      by_team     : { TEAM_CODE: array('I') }
+      by_position : { 'C': array('I'), ... }
+      by_expiry   : { '2027-28': array('I') }
     """
-    breakdown = player.get("contract_breakdown", [])
-    for row in breakdown:
-        if row.get("Year", "").startswith(str(CUR_SEASON)):
-            return parse_salary(row.get("Cap HitAnnual", "0"))
-    # fallback
-    if breakdown:
-        return parse_salary(breakdown[0].get("Cap HitAnnual", "0"))
-    return 0.0
-
-def parse_start_year(year_range):
-    """Given '2027-28', return 2027 (int)."""
-    try:
-        return int(year_range.split('-')[0])
-    except:
-        return None
+    idx = {
+        "names":       [],
+        "ids":         {},
+        "position":    [],
+        "cap_hit":     array('d'),
+        "years_left":  array('H'),
+        "expires":     [],
+        "by_team":     {},
+        "by_position": {},
+        "by_expiry":   {},
+    }
 
-def get_contract_summary(player_data, current_season_start=CUR_SEASON):
+    for pid, (name, player) in enumerate(players):
+        team      = parse_team(player.get("team", ""))
+        positions = parse_positions(player.get("team", ""))
+        summary   = get_contract_summary(player, current_season_start)
+        expires   = summary["contract_expires"]
+        try:
+            cap_hit = get_current_season_salary(player)
+        except ValueError:
+            # One malformed row shouldn't stop the app from starting
+            app.logger.warning("Unparseable cap hit for %s; indexing as 0", name)
+            cap_hit = 0.0
+
+        idx["names"].append(name)
+        idx["ids"][name] = pid
+        idx["position"].append(intern("/".join(positions)))
+        idx["cap_hit"].append(cap_hit)
+        idx["years_left"].append(summary["years_left"])
+        idx["expires"].append(intern(expires) if expires else None)
+
+        if team:
+            idx["by_team"].setdefault(team, array('I')).append(pid)
+        for pos in positions:
+            idx["by_position"].setdefault(pos, array('I')).append(pid)
+        if expires:
+            idx["by_expiry"].setdefault(expires, array('I')).append(pid)
+
+    return idx
+
+indexes = build_indexes(
+    contract_store.iter_players() if contract_store else sorted(players_data.items())
+)
+
+def get_player(name):
     """
-    Returns:
-      - years_left: seasons remaining (final_start_year - current_season_start)
-      - contract_expires: e.g. '2027-28'
-      - cap_hit_final_year: the Cap HitAnnual of that final season
+    Returns the full { team, salary, contract_breakdown } dict for name,
+    or None. In sqlite mode this reads through the store's LRU cache.
     """
-    breakdown = player_data.get("contract_breakdown", [])
-    # Filter out rows with no valid Cap HitAnnual
-    valid = [
-        row for row in breakdown
-        if (cap := row.get("Cap HitAnnual", "")) and cap not in ("UFA","RFA")
-    ]
-    if not valid:
-        return {"years_left": 0, "contract_expires": None, "cap_hit_final_year": None}
-
-    final = valid[-1]
-    final_season = final.get("Year", "")
-    final_cap    = final.get("Cap HitAnnual", "")
-
-    start_year = parse_start_year(final_season)
-    if start_year is None:
-        years_left = 0
-    else:
-        years_left = max(0, start_year - current_season_start)
+    if name not in indexes["ids"]:
+        return None
+    if contract_store:
+        return contract_store.get(name)
+    return players_data[name]
 
-    return {
-        "years_left": years_left,
-        "contract_expires": final_season,
-        "cap_hit_final_year": final_cap
-    }
+def get_roster(team_code, idx=indexes):
+    """
+    Returns the players indexed under team_code, highest cap hit first.
+    Only touches the team's own id array, so cost is O(roster size).
+    """
+    roster = []
+    for pid in idx["by_team"].get(team_code, ()):
+        name = idx["names"][pid]
+        roster.append({
+            "name":             name,
+            "positions":        idx["position"][pid].split("/") if idx["position"][pid] else [],
+            "cap_hit":          idx["cap_hit"][pid],
+            "years_left":       idx["years_left"][pid],
+            "contract_expires": idx["expires"][pid],
+        })
+    roster.sort(key=lambda p: p["cap_hit"], reverse=True)
+    return roster
 
 # ─── Core Simulation Logic ─────────────────────────────────────────────────
 
@@ -194,17 +231,20 @@ def simulate_trade(player_a, player_b, teams, league_cap=95500000.0):
 @app.route('/')
 def index():
     """Render the main dropdown page."""
-    names = sorted(players_data.keys())
-    return render_template('index.html', player_names=names)
+    return render_template('index.html', player_names=indexes["names"])
 
 @app.route('/player_details')
 def player_details():
     """AJAX endpoint: ?player=Name → contract summary JSON."""
     name = request.args.get("player", "")
-    if not name or name not in players_data:
+    if not name or name not in indexes["ids"]:
         return jsonify({"error": "Invalid or missing player name"}), 400
-    summary = get_contract_summary(players_data[name])
-    return jsonify(summary)
+    try:
+        summary = get_contract_summary(get_player(name))
+        return jsonify(summary)
+    except Exception as e:
+        app.logger.exception("Error in /player_details")
+        return jsonify({"error": str(e)}), 500
 
 @app.route('/simulate_trade', methods=['POST'])
 def simulate_trade_api():
@@ -215,12 +255,12 @@ def simulate_trade_api():
         b = data.get("player_b", "")
         if not a or not b:
             return jsonify({"error": "Both players must be selected."}), 400
-        if a not in players_data or b not in players_data:
+        if a not in indexes["ids"] or b not in indexes["ids"]:
             return jsonify({"error": "Invalid player selection."}), 400
 
         result = simulate_trade(
-            players_data[a],
-            players_data[b],
+            get_player(a),
+            get_player(b),
             teams_data,
             league_cap=95500000.0
         )
@@ -230,6 +270,19 @@ def simulate_trade_api():
         app.logger.exception("Error in /simulate_trade")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/teams/<code>/roster')
+def team_roster(code):
+    """AJAX endpoint: /teams/TOR/roster → roster with cap hits & years left."""
+    code = clean_team_code(code.strip().upper())
+    if code not in indexes["by_team"] and code not in teams_data:
+        return jsonify({"error": f"Unknown team code: {code}"}), 404
+    roster = get_roster(code)
+    return jsonify({
+        "team":          code,
+        "players":       roster,
+        "total_cap_hit": sum(p["cap_hit"] for p in roster),
+    })
+
 # ─── Entry Point ───────────────────────────────────────────────────────────
 
 if __name__ == '__main__':
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import sqlite3
+import threading
+from functools import lru_cache
+
+# ─── On-Disk Contract Store ─────────────────────────────────────────────────
+#
+# all_contracts.json has to be parsed whole, so every worker ends up holding
+# every player's contract_breakdown. This keeps the same data in a SQLite
+# file keyed by player name. The app streams it once at startup to build its
+# light indexes, then fetches full contracts on demand behind a bounded LRU.
+
+DB_FILE            = "contracts.sqlite"
+DEFAULT_CACHE_SIZE = 256
+
+def build_contract_db(players, db_path):
+    """
+    Writes { player_name: {team, salary, contract_breakdown} } to a SQLite
+    file at db_path. Builds into a temp file and renames it into place, so a
+    reader never opens a half-built database.
+    """
+    tmp = db_path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute(
+            "CREATE TABLE players ("
+            " name      TEXT PRIMARY KEY,"
+            " team      TEXT,"
+            " salary    TEXT,"
+            " breakdown TEXT NOT NULL"
+            ")"
+        )
+        conn.executemany(
+            "INSERT INTO players (name, team, salary, breakdown) VALUES (?, ?, ?, ?)",
+            (
+                (name, p.get("team"), p.get("salary"),
+                 json.dumps(p.get("contract_breakdown", []), separators=(",", ":")))
+                for name, p in players.items()
+            )
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, db_path)
+
+class ContractStore:
+    """
+    Read-only view of a contracts.sqlite file. `get(name)` returns the same
+    {team, salary, contract_breakdown} dict all_contracts.json holds, with
+    the most recently used `cache_size` players kept in memory.
+    """
+
+    def __init__(self, db_path, cache_size=DEFAULT_CACHE_SIZE):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(
+                f"{db_path} not found; build it with contractstore.py or scrapepipeline.py"
+            )
+        self.db_path = db_path
+        self.get     = lru_cache(maxsize=cache_size)(self._fetch)
+
+        # One connection for the life of the process, opened now: the open
+        # handle keeps the file readable even after scrapepipeline.py prunes
+        # this data version. Flask serves requests from several threads, so
+        # every use of the connection goes through the lock.
+        uri         = "file:" + os.path.abspath(db_path) + "?mode=ro"
+        self._conn  = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._lock  = threading.Lock()
+
+    @staticmethod
+    def _row_to_player(team, salary, breakdown):
+        return {
+            "team":               team,
+            "salary":             salary,
+            "contract_breakdown": json.loads(breakdown),
+        }
+
+    def _fetch(self, name):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT team, salary, breakdown FROM players WHERE name = ?", (name,)
+            ).fetchone()
+        return self._row_to_player(*row) if row else None
+
+    def iter_players(self):
+        """
+        Yields (name, player) in name order, reading in small batches and
+        bypassing the cache. Used to build indexes without loading every contract.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT name, team, salary, breakdown FROM players ORDER BY name"
+            )
+        while True:
+            # Fetch in batches so the lock is never held while the caller runs
+            with self._lock:
+                rows = cursor.fetchmany(500)
+            if not rows:
+                break
+            for name, team, salary, breakdown in rows:
+                yield name, self._row_to_player(team, salary, breakdown)
+
+def main():
+    # Convert an existing all_contracts.json (default: beside this script)
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(data_dir, "all_contracts.json"), encoding="utf-8") as f:
+        players = json.load(f)
+
+    db_path = os.path.join(data_dir, DB_FILE)
+    build_contract_db(players, db_path)
+    print(f"✅ Saved {len(players)} players to {db_path}")
+
+if __name__ == "__main__":
+    main()
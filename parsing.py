@@ -0,0 +1,108 @@
+# ─── Parsing Helpers ───────────────────────────────────────────────────────
+#
+# Shared by app.py and scrapepipeline.py so the app and scrape validation
+# agree on how salaries, team codes, positions and contracts are read.
+# No imports or I/O here, so importing this module has no side effects.
+
+def parse_salary(salary):
+    """
+    Converts '$13,250,000' to 13250000.0, leaves numbers untouched.
+    """
+    if isinstance(salary, (int, float)):
+        return float(salary)
+    if not salary:
+        return 0.0
+    # strip out dollar signs, commas, spaces
+    return float(salary.replace('$', '').replace(',', '').replace(' ', ''))
+
+def parse_team(team_str):
+    """
+    Player JSON is stored as e.g. 'TOR, C'; return 'TOR' to match team codes.
+    """
+    return team_str.split(',')[0].strip() if team_str else ''
+
+def parse_positions(team_str):
+    """
+    Player JSON is stored as e.g. 'TOR, C/LW'; return ['C', 'LW'].
+    """
+    if not team_str or ',' not in team_str:
+        return []
+    pos = team_str.split(',', 1)[1].strip()
+    return [p.strip() for p in pos.split('/') if p.strip()]
+
+def clean_team_code(team_code):
+    """
+    If the team code is doubled (e.g. 'VGKVGK'), return only the first half.
+    """
+    if team_code:
+        length = len(team_code)
+        half = length // 2
+        if length % 2 == 0 and team_code[:half] == team_code[half:]:
+            return team_code[:half]
+    return team_code
+
+# ─── Contract Helpers ───────────────────────────────────────────────────────
+
+CUR_SEASON = 2024  # adjust as needed for the current NHL season start
+
+# Cap HitAnnual values for seasons with no cap hit (not signed / no data)
+NON_CAP_HITS = ("UFA", "RFA", "-")
+
+def parse_cap_hit(row):
+    """Cap HitAnnual of a contract_breakdown row; 0.0 for NON_CAP_HITS."""
+    cap = row.get("Cap HitAnnual", "0")
+    return 0.0 if cap in NON_CAP_HITS else parse_salary(cap)
+
+def get_current_season_salary(player):
+    """
+    From the player's contract_breakdown, find the row where Year starts
+    with the current season (e.g. '2024-25') and return its Cap HitAnnual.
+    Fallback to the first row if no exact match.
+    """
+    breakdown = player.get("contract_breakdown", [])
+    for row in breakdown:
+        if row.get("Year", "").startswith(str(CUR_SEASON)):
+            return parse_cap_hit(row)
+    # fallback
+    if breakdown:
+        return parse_cap_hit(breakdown[0])
+    return 0.0
+
+def parse_start_year(year_range):
+    """Given '2027-28', return 2027 (int)."""
+    try:
+        return int(year_range.split('-')[0])
+    except:
+        return None
+
+def get_contract_summary(player_data, current_season_start=CUR_SEASON):
+    """
+    Returns:
+      - years_left: seasons remaining (final_start_year - current_season_start)
+      - contract_expires: e.g. '2027-28'
+      - cap_hit_final_year: the Cap HitAnnual of that final season
+    """
+    breakdown = player_data.get("contract_breakdown", [])
+    # Filter out rows with no valid Cap HitAnnual
+    valid = [
+        row for row in breakdown
+        if (cap := row.get("Cap HitAnnual", "")) and cap not in NON_CAP_HITS
+    ]
+    if not valid:
+        return {"years_left": 0, "contract_expires": None, "cap_hit_final_year": None}
+
+    final = valid[-1]
+    final_season = final.get("Year", "")
+    final_cap    = final.get("Cap HitAnnual", "")
+
+    start_year = parse_start_year(final_season)
+    if start_year is None:
+        years_left = 0
+    else:
+        years_left = max(0, start_year - current_season_start)
+
+    return {
+        "years_left": years_left,
+        "contract_expires": final_season,
+        "cap_hit_final_year": final_cap
+    }
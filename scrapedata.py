@@ -6,7 +6,7 @@ from bs4 import BeautifulSoup
 from playwright.sync_api import sync_playwright
 
 # ─── Make sure JSON is always written beside this script ────────────────────
-os.chdir(os.path.dirname(os.path.abspath(__file__)))
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 def scrape_players(page):
     RANKINGS = (
@@ -75,7 +75,13 @@ def scrape_contract(page, url, timeout=30):
 
     return data
 
-def main():
+def scrape_all_contracts(stop=None):
+    """
+    Scrape the rankings list, then every player's contract page.
+    Returns { player_name: {team, salary, contract_breakdown} }.
+    If `stop` (a threading.Event) is set, gives up between players and
+    returns what it has so far.
+    """
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         page    = browser.new_page()
@@ -85,6 +91,9 @@ def main():
 
         all_contracts = {}
         for info in players:
+            if stop is not None and stop.is_set():
+                print("⏹️  Contract scrape stopped early")
+                break
             url = info["contract_url"]
             if not url:
                 continue
@@ -100,7 +109,12 @@ def main():
 
         browser.close()
 
-    out_path = os.path.join(os.getcwd(), "all_contracts.json")
+    return all_contracts
+
+def main():
+    all_contracts = scrape_all_contracts()
+
+    out_path = os.path.join(BASE_DIR, "all_contracts.json")
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(all_contracts, f, indent=2)
     print(f"✅  Saved {len(all_contracts)} players to {out_path}")
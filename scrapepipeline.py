@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+
+from scrapeteamcap import scrape_nhl_team_caps
+from scrapedata import scrape_all_contracts
+from contractstore import build_contract_db, DB_FILE
+from parsing import (
+    parse_salary, parse_team, clean_team_code,
+    get_current_season_salary, get_contract_summary,
+)
+
+# ─── Data Layout ────────────────────────────────────────────────────────────
+#
+#   data/
+#     CURRENT                 ← name of the published version (one line)
+#     20261019T120000/
+#       all_contracts.json
+#       nhl_team_caps.json
+#       contracts.sqlite      ← same contracts, for CONTRACT_STORE=sqlite
+#       manifest.json         ← counts + per-stage timings
+#     .staging-20261019T130000/   (only while a refresh is running)
+#
+# A version directory is only renamed into place once its files are written
+# and validated, and CURRENT is swapped with os.replace, so app.py never sees
+# a half-written file or contracts and cap tables from different runs.
+
+BASE_DIR     = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR     = os.path.join(BASE_DIR, "data")
+CURRENT_FILE = os.path.join(DATA_DIR, "CURRENT")
+
+CONTRACTS_FILE = "all_contracts.json"
+TEAM_CAPS_FILE = "nhl_team_caps.json"
+MANIFEST_FILE  = "manifest.json"
+
+MIN_TEAMS     = 32   # every NHL club must be in the cap table
+MIN_PLAYERS   = 500  # the rankings page lists ~720; far fewer means a bad scrape
+MAX_UNKNOWN_TEAM_FRACTION = 0.05  # unaffiliated players tolerated before rejecting
+KEEP_VERSIONS = 3    # published versions kept on disk, including the current one
+
+# ─── Helpers ────────────────────────────────────────────────────────────────
+
+def timed(timings, stage, fn, *args):
+    """Run fn(*args), recording its wall time in seconds under timings[stage]."""
+    start = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        timings[stage] = round(time.perf_counter() - start, 3)
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+# ─── Validation ─────────────────────────────────────────────────────────────
+
+def validate(contracts, team_caps):
+    """
+    Sanity-check a scrape before publishing it, running the same parsing
+    app.py does at load time. Raises ValueError describing the first
+    problem found.
+    """
+    if not isinstance(team_caps, list) or len(team_caps) < MIN_TEAMS:
+        raise ValueError(f"Expected at least {MIN_TEAMS} teams, got {len(team_caps or [])}")
+    for info in team_caps:
+        for key in ("Team", "Active", "Cap SpaceAll", "Total CapAllocations"):
+            if not info.get(key):
+                raise ValueError(f"Team cap row missing '{key}': {info}")
+        for key in ("Active", "Cap SpaceAll", "Total CapAllocations"):
+            try:
+                parse_salary(info[key])
+            except ValueError:
+                raise ValueError(f"{info['Team']} has unparseable '{key}': {info[key]!r}")
+
+    if not isinstance(contracts, dict) or len(contracts) < MIN_PLAYERS:
+        raise ValueError(f"Expected at least {MIN_PLAYERS} players, got {len(contracts or {})}")
+
+    codes   = {clean_team_code(info["Team"]) for info in team_caps}
+    unknown = []
+    for name, player in contracts.items():
+        if not player.get("contract_breakdown"):
+            raise ValueError(f"{name} has no contract_breakdown")
+        try:
+            get_current_season_salary(player)
+            get_contract_summary(player)
+        except (ValueError, AttributeError, TypeError) as e:
+            raise ValueError(f"{name} has an unparseable contract: {e}")
+        team = parse_team(player.get("team"))
+        if team not in codes:
+            unknown.append(name)
+            print(f"⚠️  {name} is on '{team}', which is not in the cap table")
+
+    # A few players without a team tag is normal; many means the scrape or
+    # the cap table is off
+    if len(unknown) > MAX_UNKNOWN_TEAM_FRACTION * len(contracts):
+        raise ValueError(
+            f"{len(unknown)} of {len(contracts)} players are on teams not in the cap table"
+        )
+
+# ─── Publish ────────────────────────────────────────────────────────────────
+
+def current_version():
+    """Name of the published version directory, or None if nothing is published."""
+    try:
+        with open(CURRENT_FILE, encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def publish(staging, version):
+    """
+    Rename the staging directory to its final versioned name, then atomically
+    point CURRENT at it.
+    """
+    final = os.path.join(DATA_DIR, version)
+    os.rename(staging, final)
+
+    tmp = CURRENT_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(version + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, CURRENT_FILE)
+    return final
+
+def prune_versions(keep=KEEP_VERSIONS):
+    """Delete the oldest published versions beyond `keep`, never the current one."""
+    current  = current_version()
+    versions = sorted(
+        d for d in os.listdir(DATA_DIR)
+        if not d.startswith(".") and os.path.isdir(os.path.join(DATA_DIR, d))
+    )
+    for old in versions[:-keep] if keep else versions:
+        if old != current:
+            shutil.rmtree(os.path.join(DATA_DIR, old), ignore_errors=True)
+
+# ─── Pipeline ───────────────────────────────────────────────────────────────
+
+def run_pipeline():
+    """
+    Scrape team caps and player contracts concurrently, stage and validate
+    them, then publish as a new data version. Returns the manifest dict.
+    """
+    version = time.strftime("%Y%m%dT%H%M%S")
+    staging = os.path.join(DATA_DIR, f".staging-{version}")
+    os.makedirs(staging)
+
+    timings = {}
+    started = time.perf_counter()
+    stop    = threading.Event()
+    pool    = ThreadPoolExecutor(max_workers=2)
+    try:
+        caps_job      = pool.submit(timed, timings, "scrape_team_caps", scrape_nhl_team_caps)
+        contracts_job = pool.submit(timed, timings, "scrape_contracts", scrape_all_contracts, stop)
+
+        # Fail as soon as either stage fails instead of waiting out the
+        # (much slower) contract scrape; the stop event makes it wind down.
+        wait((caps_job, contracts_job), return_when=FIRST_EXCEPTION)
+        for job in (caps_job, contracts_job):
+            if job.done():
+                job.result()  # re-raises the failed stage's error
+        team_caps = caps_job.result()
+        contracts = contracts_job.result()
+        pool.shutdown()
+
+        timed(timings, "validate", validate, contracts, team_caps)
+
+        def stage_files():
+            write_json(os.path.join(staging, CONTRACTS_FILE), contracts)
+            write_json(os.path.join(staging, TEAM_CAPS_FILE), team_caps)
+        timed(timings, "write_staging", stage_files)
+        timed(timings, "build_contract_db", build_contract_db,
+              contracts, os.path.join(staging, DB_FILE))
+
+        timings["total"] = round(time.perf_counter() - started, 3)
+        manifest = {
+            "version":  version,
+            "players":  len(contracts),
+            "teams":    len(team_caps),
+            "timings":  timings,
+        }
+        write_json(os.path.join(staging, MANIFEST_FILE), manifest)
+
+        publish(staging, version)
+    except BaseException:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    prune_versions()
+    return manifest
+
+def main():
+    print("🕸️  Refreshing team caps and contracts…")
+    try:
+        manifest = run_pipeline()
+    except Exception as e:
+        print(f"❌ Refresh failed, published data left untouched: {e}")
+        sys.exit(1)
+
+    for stage, secs in manifest["timings"].items():
+        print(f"   {stage:<18} {secs:>8.1f}s")
+    print(
+        f"✅ Published {manifest['version']}: "
+        f"{manifest['players']} players, {manifest['teams']} teams"
+    )
+
+if __name__ == "__main__":
+    main()
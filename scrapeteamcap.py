@@ -5,7 +5,7 @@ import requests
 from bs4 import BeautifulSoup
 
 # ─── Make sure JSON lands beside this script ────────────────────────────────
-os.chdir(os.path.dirname(os.path.abspath(__file__)))
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # A real‐browser User‑Agent to avoid minimal/bot HTML
 HEADERS = {
@@ -61,7 +61,7 @@ def main():
     print()
 
     # Write out to JSON
-    out_file = "nhl_team_caps.json"
+    out_file = os.path.join(BASE_DIR, "nhl_team_caps.json")
     with open(out_file, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
     print(f"✅ Saved all team cap data to {out_file}")